@@ -12,15 +12,26 @@ Behavior:
     is used as `id` and the third TD is used as `description`.
 - Writes output JSON with fields: createdTime, version, author, fixData.
 
-Usage: run `python fix_codesets_scraper.py` (requires `beautifulsoup4`, `requests`)
+Usage: run `python fix_codesets_scraper.py` (dependencies listed in `requirements.txt`)
 
 Author: Ajin Nair
 """
 
+import asyncio
+import concurrent.futures
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+import lxml.etree
+import functools
+import hashlib
 import json
 import os
+import re
+from dataclasses import dataclass
+from typing import Optional
 from datetime import datetime
 import time
 from tqdm import tqdm
@@ -39,6 +50,13 @@ try:
 except Exception:
     SNIMissingWarning = None
 
+# orjson serializes in C and is much faster on large outputs; fall back to
+# stdlib json if it isn't installed.
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 # Silently ignore the warnings that exist in this environment.
 if InsecureRequestWarning is not None:
     warnings.filterwarnings('ignore', category=InsecureRequestWarning)
@@ -48,9 +66,211 @@ if SNIMissingWarning is not None:
 # Also disable urllib3 warnings globally (convenient when running many requests).
 urllib3.disable_warnings()
 
+# Matches the header cell of the description column; compiled once so header
+# detection is a single C-level search per cell instead of strip/lower copies.
+DESC_HDR_RE = re.compile(r'description', re.I)
+
+# All pages live under one prefix; a precomputed constant keeps the per-request
+# URL build down to a single concatenation in the hot path.
+BASE_URL = "https://fiximate.fixtrading.org/en/FIX.Latest/"
+
+# The main page is only ever queried for its table, so restrict parsing to
+# <table> subtrees and let head/navigation/footer markup be discarded.
+TABLE_STRAINER = SoupStrainer('table')
+
+# Sent with every request. Advertising Brotli alongside gzip matters because
+# these verbose table pages compress ~8-10x and clients don't offer br by
+# default; both requests and aiohttp auto-decompress it when the `brotli`
+# package is installed.
+REQUEST_HEADERS = {
+    'Accept-Encoding': 'gzip, br',
+    'Accept': 'text/html',
+    'User-Agent': 'fix-codesets-scraper/1.0',
+}
+
+
+class StdValuesTarget:
+    """Streaming lxml parser target that extracts stdValues from a detail page.
+
+    Mirrors the tree-based extraction without ever building a DOM: only the
+    first top-level table is considered, its first row is the header used to
+    locate the 'description' column, and within that column's first nested
+    table rows shaped like
+
+        <tr><td>1</td><td>=</td><td>Some description</td></tr>
+
+    are collected (middle TD must contain '=', first TD must be non-empty,
+    description prefers the first <p> in the third TD). No DOM is ever built,
+    so peak memory stays near the raw page bytes even for table-heavy pages.
+    """
+
+    def __init__(self):
+        self.details = []
+        self.table_depth = 0
+        self.outer_done = False       # finished the first top-level table
+        self.is_header_row = False
+        self.seen_header = False
+        self.header_texts = None      # list of text-chunk lists, one per header cell
+        self.desc_idx = None
+        self.cell_idx = -1            # td index within the current outer row
+        self.in_desc_cell = False
+        self.nested_seen_in_cell = False
+        self.in_nested = False
+        self.nested_tds = None        # per nested row: list of [chunks, p_chunks]
+        self.current_td = None
+        self.in_p = False
+
+    def start(self, tag, attrib):
+        if self.outer_done:
+            return
+        if tag == 'table':
+            self.table_depth += 1
+            if self.table_depth == 2 and self.in_desc_cell and not self.nested_seen_in_cell:
+                self.nested_seen_in_cell = True
+                self.in_nested = True
+            return
+        if self.table_depth == 0:
+            return
+        if self.in_nested:
+            if tag == 'tr':
+                self.nested_tds = []
+                self.current_td = None
+            elif tag == 'td' and self.nested_tds is not None and self.current_td is None:
+                self.current_td = [[], None]
+            elif tag == 'p' and self.current_td is not None and self.current_td[1] is None:
+                # only the first <p> of a cell is preferred as the description
+                self.current_td[1] = []
+                self.in_p = True
+        elif self.table_depth == 1:
+            if tag == 'tr':
+                self.cell_idx = -1
+                if not self.seen_header:
+                    self.is_header_row = True
+                    self.header_texts = []
+            elif self.is_header_row and tag in ('th', 'td'):
+                self.header_texts.append([])
+            elif tag == 'td':
+                self.cell_idx += 1
+                if self.desc_idx is not None and self.cell_idx == self.desc_idx:
+                    self.in_desc_cell = True
+                    self.nested_seen_in_cell = False
+
+    def data(self, text):
+        if self.outer_done:
+            return
+        if self.in_nested:
+            if self.current_td is not None:
+                self.current_td[0].append(text)
+                if self.in_p:
+                    self.current_td[1].append(text)
+        elif self.is_header_row and self.header_texts:
+            self.header_texts[-1].append(text)
+
+    def end(self, tag):
+        if self.outer_done:
+            return
+        if tag == 'table':
+            if self.table_depth == 2 and self.in_nested:
+                self.in_nested = False
+                self.nested_tds = None
+                self.current_td = None
+            self.table_depth -= 1
+            if self.table_depth == 0:
+                self.outer_done = True
+            return
+        if self.in_nested:
+            if tag == 'td' and self.current_td is not None:
+                self.nested_tds.append(self.current_td)
+                self.current_td = None
+                self.in_p = False
+            elif tag == 'p':
+                self.in_p = False
+            elif tag == 'tr' and self.nested_tds is not None:
+                self._finish_nested_row()
+        elif self.table_depth == 1:
+            if tag == 'tr' and self.is_header_row:
+                self._finish_header_row()
+            elif tag == 'td':
+                self.in_desc_cell = False
+
+    def _finish_header_row(self):
+        """Locate the 'description' column from the collected header cell texts."""
+        self.is_header_row = False
+        self.seen_header = True
+        for i, chunks in enumerate(self.header_texts):
+            if DESC_HDR_RE.search(''.join(chunks)):
+                self.desc_idx = i
+        self.header_texts = None
+
+    def _finish_nested_row(self):
+        tds = self.nested_tds
+        self.nested_tds = []
+        self.current_td = None
+        if len(tds) < 3:
+            return
+        # require the middle cell to contain '=' to accept this row
+        if '=' not in ''.join(tds[1][0]).strip():
+            return
+        id_text = ''.join(tds[0][0]).strip()
+        if not id_text:
+            return
+        chunks, p_chunks = tds[2]
+        desc_text = ''.join(p_chunks if p_chunks is not None else chunks).strip()
+        self.details.append({'id': id_text, 'description': desc_text})
+
+    def close(self):
+        return self.details
+
+
+def parse_detail_page(content):
+    """Parse a detail page's HTML bytes into a stdValues list.
+
+    Module-level so it can be shipped to a worker process: it takes only the
+    raw bytes and returns the small details list, keeping IPC cost minimal.
+    """
+    parser = lxml.etree.HTMLParser(target=StdValuesTarget())
+    parser.feed(content)
+    return parser.close()
+
+
+# Directory for the on-disk cache of parsed detail pages. Code-set pages change
+# rarely, so re-runs within the TTL skip both the GET and the HTML parse.
+CACHE_DIR = '.cache'
+
+
+def cache_path_for(url):
+    """Return the cache file path for a detail-page URL."""
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+
+def load_cached_details(url, max_age_seconds):
+    """Return the cached details list for url, or None if absent, expired or unreadable."""
+    path = cache_path_for(url)
+    try:
+        if time.time() - os.path.getmtime(path) > max_age_seconds:
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_details(url, details):
+    """Best-effort write of a parsed details list; cache failures never break a run."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path_for(url), 'w') as f:
+            json.dump(details, f)
+    except OSError:
+        pass
+
 
+@functools.lru_cache(maxsize=8)
 def load_env(path='.env'):
-    """Simple .env loader: returns dict of key->value. Ignores comments and blank lines."""
+    """Simple .env loader: returns dict of key->value. Ignores comments and blank lines.
+
+    Cached per path so repeated calls don't re-open and re-parse the file.
+    """
     env = {}
     try:
         with open(path, 'r') as f:
@@ -69,18 +289,66 @@ def load_env(path='.env'):
         pass
     return env
 
+@dataclass(frozen=True)
+class Config:
+    """Run configuration, assembled once from .env; every field has a default.
+
+    max_workers sizes the detail fan-out. That work is pure network I/O, so
+    CPU count is the wrong metric; the default keeps plenty of requests in
+    flight while staying polite to the remote server. cache_ttl_days of 0
+    disables the on-disk cache.
+    """
+    per_request_timeout: int = 15
+    total_timeout: int = 300
+    max_workers: int = 16
+    cache_ttl_days: int = 7
+    version_name: Optional[str] = None
+    author: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, env):
+        """Build a Config from a load_env dict, falling back to the field defaults."""
+        def as_int(key, default):
+            try:
+                return int(env.get(key, default))
+            except Exception:
+                return default
+        return cls(
+            per_request_timeout=as_int('PER_REQUEST_TIMEOUT', cls.per_request_timeout),
+            total_timeout=as_int('TOTAL_TIMEOUT', cls.total_timeout),
+            max_workers=as_int('MAX_WORKERS', cls.max_workers),
+            cache_ttl_days=as_int('CACHE_TTL_DAYS', cls.cache_ttl_days),
+            version_name=env.get('VERSION_NAME'),
+            author=env.get('AUTHOR'),
+        )
+
+
 def fetch_fix_code_sets():
+    # Load .env once up front and fold it into a single immutable config
+    cfg = Config.from_env(load_env('.env'))
+    max_workers = cfg.max_workers
+    cache_max_age = cfg.cache_ttl_days * 86400
+
+    # Share one Session across the main fetch and all worker threads so urllib3's
+    # connection pool reuses sockets (keep-alive) instead of paying a fresh
+    # TCP+TLS handshake per detail page. Size the pool to the worker count so no
+    # thread blocks waiting for a free connection, and retry transient failures.
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retries))
+
     # Step 1: Fetch the main page with FIX code sets
-    #url = "https://fiximate.fixtrading.org/en/FIX.Latest/codesets_sorted_by_name.html"
-    url = "https://fiximate.fixtrading.org/en/FIX.Latest/fields_sorted_by_tagnum.html"
-    response = requests.get(url)
+    #url = BASE_URL + "codesets_sorted_by_name.html"
+    url = BASE_URL + "fields_sorted_by_tagnum.html"
+    response = session.get(url, timeout=cfg.per_request_timeout)
 
     # Check if the request was successful
     if response.status_code != 200:
         print(f"Failed to fetch the main page: {response.status_code}")
         return
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(response.content, 'lxml', parse_only=TABLE_STRAINER)
 
     # Step 2: Find the table containing the code sets
     table = soup.find('table')
@@ -94,199 +362,186 @@ def fetch_fix_code_sets():
         # assume first row is header if it contains <th> or matches expected headings
         rows = rows[1:]
 
-    data_dict = {}
-
-    # Step 3: Extract links and corresponding details
-    # Collect code set metadata first, then fetch details concurrently
-    code_sets = []
-    # map detail-page link -> list of code_set_names that reference it
-    link_to_names = {}
+    # Records are kept in a flat list in page order; names and detail links map
+    # to list indices so attaching fetched details is a direct indexed write
+    # instead of per-name dict lookups.
+    records = []
+    name_to_idx = {}
+    # map detail-page link -> list of record indices that reference it
+    link_to_indices = {}
     seen_links = set()
-    for row in rows:
-        cols = row.find_all('td')
-        if not cols:
-            continue
-
-        code_set_name = cols[1].text.strip()
-        #tag_name = code_set_name.split('CodeSet')[0].strip()
-        anchor = cols[0].find('a')
-        # Best-effort extraction of other metadata (guard against missing cols)
-        tag_id = cols[0].text.strip() if len(cols) > 1 else ''
-        datatype = cols[4].text.strip() if len(cols) > 4 else ''
-        description = cols[6].text.strip() if len(cols) > 6 else ''
-
-        if anchor is None or not anchor.get('href'):
-            print(f"No link found for code set '{code_set_name}', skipping.")
-            continue
-
-        code_set_link = anchor.get('href')  # Extract the link safely
-        # Initialize entry with metadata; stdValues will be filled later
-        data_dict[code_set_name] = {"tagName": code_set_name, "tagId": tag_id, "description": description, "tagType": datatype, "stdValues": []}
-
-        # record mapping from link -> code set names (multiple names may share a detail page)
-        link_to_names.setdefault(code_set_link, []).append(code_set_name)
-
-        # schedule each unique detail link only once
-        if code_set_link not in seen_links:
-            seen_links.add(code_set_link)
-            code_sets.append({
-                'link': code_set_link,
-            })
-    print("codeset count:", len(code_sets))
-    #code_sets = code_sets[0:100]  # Limit to first 100 code sets for testing
-
-    # If there are no code sets, skip fetching details
-    if code_sets:
-        import concurrent.futures
-
-        # Allow configuring a total timeout for all detail fetches via .env
-        env_top = load_env('.env')
-        try:
-            total_timeout = int(env_top.get('TOTAL_TIMEOUT', '300'))
-        except Exception:
-            total_timeout = 300
-
-        def fetch_details(item):
-            """Worker: fetch detail page for a link and return (link, details_list)."""
-            link = item['link']
-            #print(f"Fetching details for link: {link}")
-            url = f"https://fiximate.fixtrading.org/en/FIX.Latest/{link}"
+
+    async def fetch_details_async(asession, sem, parse_pool, link):
+        """Worker coroutine: fetch detail page for a link and return (link, details_list)."""
+        #print(f"Fetching details for link: {link}")
+        url = BASE_URL + link
+        # stdValues extraction is deterministic, so a fresh-enough cached
+        # result lets us skip both the GET and the parse.
+        if cache_max_age > 0:
+            cached = load_cached_details(url, cache_max_age)
+            if cached is not None:
+                return link, cached
+        async with sem:
             try:
-                resp = requests.get(url, timeout=15)
+                async with asession.get(url) as resp:
+                    if resp.status != 200:
+                        print(f"Failed to fetch details for {link}: {resp.status}")
+                        return link, []
+                    content = await resp.read()
             except Exception as e:
                 print(f"Error fetching {link}: {e}")
                 return link, []
 
-            if resp.status_code != 200:
-                print(f"Failed to fetch details for {link}: {resp.status_code}")
-                return link, []
-
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            table = soup.find('table')
-            if table is None:
-                print(f"No detail table found for {link}.")
-                return link, []
-
-            all_rows = table.find_all('tr')
-            if not all_rows:
-                return link, []
-
-            # Detect header row and column indexes by header text
-            header_cells = all_rows[0].find_all(['th', 'td'])
-            has_header = bool(header_cells)
-            desc_idx = None
-            id_idx = None
-            if has_header:
-                headers = [hc.get_text(strip=True).lower() for hc in header_cells]
-                for i, h in enumerate(headers):
-                    if 'description' in h:
-                        desc_idx = i
-                    # pick a reasonable id column if present
-                    if id_idx is None and any(k in h for k in ('id', 'value', 'code', 'tag')):
-                        id_idx = i
-
-            # default id col to 0 if not found
-            if id_idx is None:
-                id_idx = 0
-
-            # Only use the explicitly-detected "description" column to build stdValues.
-            # Within that column we expect a nested table where rows look like:
-            # <tr><td>1</td><td>=</td><td>Some description</td></tr>
-            # If no description column is detected, do not populate stdValues.
-            if desc_idx is None:
-                return link, []
-
-            rows = all_rows[1:] if has_header else all_rows
-
-            details = []
-            for r in rows:
-                cols = r.find_all('td')
-                if not cols or len(cols) <= desc_idx:
-                    continue
-
-                desc_td = cols[desc_idx]
-                nested_table = desc_td.find('table')
-                if nested_table is None:
-                    # No nested table in description cell; skip this row
-                    continue
-
-                for tr in nested_table.find_all('tr'):
-                    tds = tr.find_all('td')
-                    if len(tds) < 3:
-                        continue
-                    sep = tds[1].get_text(strip=True)
-                    # require the middle cell to contain '=' to accept this row
-                    if '=' not in sep:
+        # Hand the raw bytes to the process pool so parsing scales across
+        # cores while this coroutine goes back to driving the network.
+        try:
+            details = await asyncio.get_running_loop().run_in_executor(parse_pool, parse_detail_page, content)
+        except Exception as e:
+            print(f"Failed to parse detail page for {link}: {e}")
+            return link, []
+
+        if cache_max_age > 0:
+            store_cached_details(url, details)
+        return link, details
+
+    async def scrape_details():
+        """Walk the main-page rows and fan detail fetches out as links appear.
+
+        Submitting each fetch the moment its row yields a new link overlaps
+        the rest of the row walk with the first responses, instead of
+        serializing the whole metadata pass before any network traffic.
+        """
+        # One keep-alive connection pool serves every in-flight request; the
+        # semaphore bounds concurrency politely to max_workers.
+        connector = aiohttp.TCPConnector(limit=max_workers, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=cfg.per_request_timeout)
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as parse_pool:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=REQUEST_HEADERS) as asession:
+                sem = asyncio.Semaphore(max_workers)
+                tasks = []
+
+                # Step 3: Extract links and corresponding details
+                for row in rows:
+                    cols = row.find_all('td')
+                    if not cols:
                         continue
 
-                    id_text = tds[0].get_text(strip=True)
-                    p = tds[2].find('p')
-                    desc_text = p.get_text(strip=True) if p else tds[2].get_text(strip=True)
-                    if id_text:
-                        details.append({'id': id_text, 'description': desc_text})
+                    code_set_name = cols[1].text.strip()
+                    #tag_name = code_set_name.split('CodeSet')[0].strip()
+                    anchor = cols[0].find('a')
+                    # Best-effort extraction of other metadata (guard against missing cols)
+                    tag_id = cols[0].text.strip() if len(cols) > 1 else ''
+                    datatype = cols[4].text.strip() if len(cols) > 4 else ''
+                    description = cols[6].text.strip() if len(cols) > 6 else ''
 
-            return link, details
-
-        # Choose a reasonable worker count; keep small to be polite to the remote server
-        max_workers = min(10, max(2, (os.cpu_count() or 2)))
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futures = [ex.submit(fetch_details, item) for item in code_sets]
-            # Show progress as futures complete. Respect a global timeout (total_timeout).
-            start = time.time()
-            try:
-                for fut in tqdm(concurrent.futures.as_completed(futures, timeout=total_timeout), total=len(futures), desc="Fetching details"):
-                    try:
-                        link, details = fut.result()
-                    except Exception as e:
-                        print(f"Worker raised exception: {e}")
+                    if anchor is None or not anchor.get('href'):
+                        print(f"No link found for code set '{code_set_name}', skipping.")
                         continue
 
-                    # Attach fetched details into data_dict for all code-set names that reference this link
-                    names = link_to_names.get(link, [])
-                    if not names:
-                        # fallback: store under link key
-                        data_dict[link] = {"stdValues": details}
+                    code_set_link = anchor.get('href')  # Extract the link safely
+                    # Initialize entry with metadata; stdValues will be filled later.
+                    # A repeated name replaces its earlier record, as the dict keying did.
+                    entry = {"tagName": code_set_name, "tagId": tag_id, "description": description, "tagType": datatype, "stdValues": []}
+                    idx = name_to_idx.get(code_set_name)
+                    if idx is None:
+                        idx = len(records)
+                        records.append(entry)
+                        name_to_idx[code_set_name] = idx
                     else:
-                        for cs_name in names:
-                            if cs_name in data_dict:
-                                data_dict[cs_name]["stdValues"] = details
-                            else:
-                                data_dict[cs_name] = {"stdValues": details}
-            except concurrent.futures.TimeoutError:
-                # Some tasks didn't finish within the global timeout
-                elapsed = time.time() - start
-                remaining = max(0, total_timeout - int(elapsed))
-                print(f"Warning: overall timeout of {total_timeout}s reached after {int(elapsed)}s; cancelling remaining tasks")
-                for fut in futures:
-                    if not fut.done():
-                        fut.cancel()
-    
-    # Convert data_dict (mapping name -> metadata) into an array of objects.
-    # Use only the metadata values (no `name` field) as requested.
-    code_sets_array = list(data_dict.values())
-    fix_data = [{"type": "FIX", "data": code_sets_array}]
+                        records[idx] = entry
+
+                    # record mapping from link -> record indices (multiple code sets may share a detail page)
+                    link_to_indices.setdefault(code_set_link, []).append(idx)
+
+                    # schedule each unique detail link the moment it is seen,
+                    # then yield so submitted fetches progress while the
+                    # remaining rows are still being walked
+                    if code_set_link not in seen_links:
+                        seen_links.add(code_set_link)
+                        tasks.append(asyncio.ensure_future(fetch_details_async(asession, sem, parse_pool, code_set_link)))
+                        await asyncio.sleep(0)
+                print("codeset count:", len(tasks))
+
+                # If there are no code sets, skip waiting for details
+                if not tasks:
+                    return results
+
+                # Show progress as tasks complete. Respect a global timeout (total_timeout).
+                start = time.time()
+                # Coarser refresh (mininterval) keeps tqdm's own overhead
+                # negligible when completions arrive in bursts.
+                progress = tqdm(total=len(tasks), desc="Fetching details", mininterval=0.5, smoothing=0)
+                try:
+                    for fut in asyncio.as_completed(tasks, timeout=cfg.total_timeout):
+                        try:
+                            results.append(await fut)
+                        except asyncio.TimeoutError:
+                            raise
+                        except Exception as e:
+                            print(f"Worker raised exception: {e}")
+                        progress.update(1)
+                except asyncio.TimeoutError:
+                    # Some tasks didn't finish within the global timeout
+                    elapsed = time.time() - start
+                    print(f"Warning: overall timeout of {cfg.total_timeout}s reached after {int(elapsed)}s; cancelling remaining tasks")
+                finally:
+                    # Drop whatever is still pending — global timeout, Ctrl-C or
+                    # an unexpected error all land here. Cancellation reaches an
+                    # in-flight request at its next await, so worst-case runtime
+                    # is bounded by total_timeout rather than total_timeout plus
+                    # the slowest outstanding request.
+                    pending = [task for task in tasks if not task.done()]
+                    if pending:
+                        for task in pending:
+                            task.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                    progress.close()
+        return results
+
+    # All records referencing one link already share a single details list;
+    # interning also collapses identical lists that arrive via different
+    # links (or separate cache loads) into one shared object.
+    details_intern = {}
+    for link, details in asyncio.run(scrape_details()):
+        key = tuple((d['id'], d['description']) for d in details)
+        details = details_intern.setdefault(key, details)
+        # Attach fetched details to every record that references this link
+        indices = link_to_indices.get(link, [])
+        if not indices:
+            # fallback: keep the details as a bare record
+            records.append({"stdValues": details})
+        else:
+            for i in indices:
+                records[i]["stdValues"] = details
+
     # Read version name from .env (if present) and generate a version string
-    env = load_env('.env')
-    PER_REQUEST_TIMEOUT = int(env.get('PER_REQUEST_TIMEOUT', '15'))
-    TOTAL_TIMEOUT = int(env.get('TOTAL_TIMEOUT', '300'))
-    MAX_WORKERS = int(env.get('MAX_WORKERS', '8'))
-    version_name = env.get('VERSION_NAME')
     timestamp_for_version = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
-    if version_name:
-        version = f"{version_name}+{timestamp_for_version}"
+    if cfg.version_name:
+        version = f"{cfg.version_name}+{timestamp_for_version}"
     else:
         version = timestamp_for_version
 
-    json_output_dict = {
-        "createdTime": datetime.now().replace(microsecond=0).isoformat() + "Z",
-        "version": version,
-        "author": env.get('AUTHOR'),
-        "fixData": fix_data,
-    }
-
-    # Step 5: Save the data to a JSON file
-    with open('fix_code_sets.json', 'w') as json_file:
-        json.dump(json_output_dict, json_file, indent=4)
+    def dump_value(value):
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(',', ':')).encode()
+
+    # Step 5: Stream the JSON to disk one record per line. The records list
+    # (already the ordered array of objects, no `name` field) is the only copy
+    # of the dataset held in memory; no wrapper dict or serializer-side buffer
+    # of the whole output is ever built.
+    created_time = datetime.now().replace(microsecond=0).isoformat() + "Z"
+    with open('fix_code_sets.json', 'wb') as json_file:
+        json_file.write(b'{"createdTime": ' + dump_value(created_time)
+                        + b', "version": ' + dump_value(version)
+                        + b', "author": ' + dump_value(cfg.author)
+                        + b', "fixData": [{"type": "FIX", "data": [\n')
+        for i, record in enumerate(records):
+            if i:
+                json_file.write(b',\n')
+            json_file.write(dump_value(record))
+        json_file.write(b'\n]}]}\n')
 
     # Print a friendly success message in green so it's easy to spot in the terminal
     GREEN = "\033[32m"
@@ -297,6 +552,8 @@ if __name__ == "__main__":
     try:
         print("Starting to fetch FIX code sets...")
         fetch_fix_code_sets()
+    except KeyboardInterrupt:
+        print("Interrupted by user; exiting.")
     except Exception as e:
         print(f"An error occurred: {e}")
 #         Exception: If any step in the process fails